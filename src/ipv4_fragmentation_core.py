@@ -0,0 +1,516 @@
+"""
+IPv4 Fragmentation Visualizer - Core Logic
+RFC 791 fragmentation engine, configuration and design constants
+
+This module has no Tk imports, so the fragmentation logic can be used
+headless (scripts, tests) without loading customtkinter. Only
+DesignConstants.init_fonts() imports it, once a Tk root exists.
+
+Author: Professional Refactor
+Date: 2026-01-16
+RFC 791 Compliant
+"""
+
+import functools
+import json
+import logging
+import os
+from array import array
+from typing import TYPE_CHECKING, Callable, List, Tuple, Dict, Any, Optional, Iterator, NamedTuple
+from dataclasses import dataclass, field
+
+if TYPE_CHECKING:
+    import customtkinter as ctk
+
+
+# ==================== CONFIGURATION MANAGEMENT ====================
+
+_CONFIG_ENCODER = json.JSONEncoder(indent=2)
+
+
+@dataclass
+class AppConfig:
+    """Application configuration with validation limits"""
+    # Theme
+    appearance_mode: str = "light"
+    color_theme: str = "blue"
+    
+    # Window
+    window_width: int = 1400
+    window_height: int = 900
+    min_width: int = 1200
+    min_height: int = 700
+    
+    # Defaults
+    default_packet_size: int = 1500
+    default_header_size: int = 20
+    default_mtu_path: str = "1500, 576, 1500"
+    
+    # Validation Limits (RFC 791 compliant)
+    min_packet_size: int = 20
+    max_packet_size: int = 65535
+    min_header_size: int = 20
+    max_header_size: int = 60
+    min_mtu: int = 68  # RFC 791 minimum
+    max_mtu: int = 65535
+    max_fragment_offset: int = 8191  # 13-bit field maximum
+    
+    # Export
+    export_directory: str = "exports"
+    auto_timestamp: bool = True
+    
+    @classmethod
+    def load(cls, config_path: str = "config.json") -> 'AppConfig':
+        """Load configuration from file"""
+        # EAFP: a single stat() both checks existence and keys the parse cache;
+        # a missing or malformed file falls back to defaults
+        try:
+            data = _read_config_file(config_path, os.stat(config_path).st_mtime_ns)
+            return cls(**data)
+        except Exception:
+            return cls()
+    
+    def save(self, config_path: str = "config.json"):
+        """Save configuration to file"""
+        try:
+            # Encode in one go and write once; json.dump would issue a write
+            # per token. Fields are flat, so vars() replaces a recursive asdict()
+            with open(config_path, 'w') as f:
+                f.write(_CONFIG_ENCODER.encode(vars(self)))
+        except Exception as e:
+            logging.error(f"Failed to save config: {e}")
+
+
+@functools.lru_cache(maxsize=8)
+def _read_config_file(config_path: str, mtime_ns: int) -> Dict[str, Any]:
+    """Parse a config file; the mtime key makes edits invalidate the cache"""
+    with open(config_path, 'r') as f:
+        return json.load(f)
+
+
+@functools.lru_cache(maxsize=1)
+def _default_config() -> AppConfig:
+    """Shared default configuration used for validation limits (read-only)"""
+    return AppConfig()
+
+
+# ==================== DESIGN CONSTANTS ====================
+
+class DesignConstants:
+    """UI Design constants for consistent styling"""
+    # Fonts
+    FONT_FAMILY = "Roboto"
+    FONT_SIZE_TITLE = 28
+    FONT_SIZE_SUBTITLE = 13
+    FONT_SIZE_SECTION = 20
+    FONT_SIZE_LABEL = 12
+    FONT_SIZE_INPUT = 14
+    FONT_SIZE_HEADER = 13
+    FONT_SIZE_CELL = 12
+    FONT_SIZE_HOP = 16
+    FONT_SIZE_FOOTER_TITLE = 16
+    FONT_SIZE_FOOTER_TEXT = 11
+    
+    # Spacing
+    PADDING_LARGE = 40
+    PADDING_MEDIUM = 20
+    PADDING_SMALL = 10
+    
+    # Component Sizes
+    INPUT_HEIGHT = 38
+    BUTTON_HEIGHT = 38
+    HEADER_HEIGHT = 80
+    TOOLBAR_HEIGHT = 100
+    TABLE_HEADER_HEIGHT = 40
+    TABLE_ROW_HEIGHT = 36
+    TABLE_MAX_VISIBLE_ROWS = 20  # Rows shown before a hop table scrolls
+    FOOTER_HEIGHT = 180
+    HOP_HEADER_HEIGHT = 70  # Hop title row, used to size unmaterialized hops
+    
+    # Hop virtualization, in viewport heights around the visible area
+    HOP_PRELOAD_SCREENS = 1
+    HOP_RELEASE_SCREENS = 3
+    
+    # Timing (ms)
+    SIMULATE_DEBOUNCE_MS = 50
+    THEME_DEBOUNCE_MS = 50
+    
+    # Corners
+    CORNER_LARGE = 16
+    CORNER_MEDIUM = 8
+    CORNER_SMALL = 6
+    
+    # Shared font objects, created once by init_fonts() after the Tk root exists
+    FONT_TITLE: Optional["ctk.CTkFont"] = None
+    FONT_SUBTITLE: Optional["ctk.CTkFont"] = None
+    FONT_LABEL: Optional["ctk.CTkFont"] = None
+    FONT_LABEL_BOLD: Optional["ctk.CTkFont"] = None
+    FONT_INPUT: Optional["ctk.CTkFont"] = None
+    FONT_INPUT_BOLD: Optional["ctk.CTkFont"] = None
+    FONT_TOOLTIP: Optional["ctk.CTkFont"] = None
+    FONT_HOP: Optional["ctk.CTkFont"] = None
+    FONT_ICON: Optional["ctk.CTkFont"] = None
+    FONT_WELCOME_TITLE: Optional["ctk.CTkFont"] = None
+    FONT_FOOTER_HEADING: Optional["ctk.CTkFont"] = None
+    FONT_FOOTER_TEXT: Optional["ctk.CTkFont"] = None
+    FONT_ITALIC: Optional["ctk.CTkFont"] = None
+    FONT_LINK: Optional["ctk.CTkFont"] = None
+    FONT_MONO: Optional["ctk.CTkFont"] = None
+    FONT_TABLE_HEADER: Optional["ctk.CTkFont"] = None
+    FONT_CELL: Optional["ctk.CTkFont"] = None
+    FONT_CELL_BOLD: Optional["ctk.CTkFont"] = None
+    
+    @classmethod
+    def init_fonts(cls):
+        """Create the shared fonts once; every widget references these instances"""
+        if cls.FONT_TITLE is not None:
+            return
+        
+        import customtkinter as ctk
+        
+        family = cls.FONT_FAMILY
+        cls.FONT_TITLE = ctk.CTkFont(family=family, size=cls.FONT_SIZE_TITLE, weight="bold")
+        cls.FONT_SUBTITLE = ctk.CTkFont(family=family, size=cls.FONT_SIZE_SUBTITLE)
+        cls.FONT_LABEL = ctk.CTkFont(family=family, size=cls.FONT_SIZE_LABEL)
+        cls.FONT_LABEL_BOLD = ctk.CTkFont(family=family, size=cls.FONT_SIZE_LABEL, weight="bold")
+        cls.FONT_INPUT = ctk.CTkFont(family=family, size=cls.FONT_SIZE_INPUT)
+        cls.FONT_INPUT_BOLD = ctk.CTkFont(family=family, size=cls.FONT_SIZE_INPUT, weight="bold")
+        cls.FONT_TOOLTIP = ctk.CTkFont(family=family, size=10)
+        cls.FONT_HOP = ctk.CTkFont(family=family, size=cls.FONT_SIZE_HOP, weight="bold")
+        cls.FONT_ICON = ctk.CTkFont(size=64)
+        cls.FONT_WELCOME_TITLE = ctk.CTkFont(family=family, size=24, weight="bold")
+        cls.FONT_FOOTER_HEADING = ctk.CTkFont(family=family, size=18, weight="bold")
+        cls.FONT_FOOTER_TEXT = ctk.CTkFont(family=family, size=cls.FONT_SIZE_FOOTER_TEXT)
+        cls.FONT_ITALIC = ctk.CTkFont(family=family, size=12, slant="italic")
+        cls.FONT_LINK = ctk.CTkFont(family=family, size=12, underline=True)
+        cls.FONT_MONO = ctk.CTkFont(family="Courier New", size=12)
+        # Named fonts for the hop Treeviews, which otherwise resolve a font tuple per use
+        cls.FONT_TABLE_HEADER = ctk.CTkFont(family=family, size=cls.FONT_SIZE_HEADER, weight="bold")
+        cls.FONT_CELL = ctk.CTkFont(family=family, size=cls.FONT_SIZE_CELL)
+        cls.FONT_CELL_BOLD = ctk.CTkFont(family=family, size=cls.FONT_SIZE_CELL, weight="bold")
+
+
+# ==================== FRAGMENTATION CORE LOGIC ====================
+
+@functools.lru_cache(maxsize=256)
+def _fragment_layout(data_size: int, max_data: int) -> Tuple[array, array]:
+    """
+    Relative fragment layout of a payload split into max_data-sized pieces.
+    
+    Every fragment but the last carries exactly max_data bytes, so the layout
+    is an arithmetic progression of full fragments plus an optional tail. It
+    only depends on (data_size, max_data), which repeats for every full
+    fragment of the previous hop, so results are memoized.
+    
+    Returns:
+        Two int32 columns: data lengths and offsets (8-byte units) relative
+        to the first fragment
+    """
+    n_full, tail = divmod(data_size, max_data)
+    step = max_data >> 3
+    end = n_full * step
+    lengths = array('i', [max_data]) * n_full
+    # Offsets advance by a constant step: a range, no per-fragment arithmetic
+    rel_offsets = array('i', range(0, end, step))
+    if tail:
+        lengths.append(tail)
+        rel_offsets.append(end)
+    return lengths, rel_offsets
+
+
+class FragRow(NamedTuple):
+    """One fragment with every displayed field precomputed"""
+    seq: int
+    fid: int
+    total_size: int
+    data_size: int
+    offset_bytes: int
+    offset_units: int
+    mf_flag: bool
+
+
+class HopResult(NamedTuple):
+    """Fragments leaving one hop of the simulated path"""
+    hop_num: int
+    mtu: int
+    fragments: List[FragRow]
+
+
+@dataclass
+class FragmentTable:
+    """
+    Fragments of a single hop stored as Structure-of-Arrays
+    
+    Each field is a contiguous int32 column, so a fragment costs 16 bytes
+    instead of a tuple of four boxed ints. Iterating the table yields the
+    classic (fragment_id, data_length, fragment_offset, sequence_num) tuples.
+    """
+    ids: array = field(default_factory=lambda: array('i'))
+    lengths: array = field(default_factory=lambda: array('i'))
+    offsets: array = field(default_factory=lambda: array('i'))
+    seqs: array = field(default_factory=lambda: array('i'))
+    
+    def __len__(self) -> int:
+        return len(self.seqs)
+    
+    def __iter__(self) -> Iterator[Tuple[int, int, int, int]]:
+        return zip(self.ids, self.lengths, self.offsets, self.seqs)
+    
+    def append(self, fragment_id: int, data_length: int, fragment_offset: int, seq_num: int):
+        """Append a single fragment row"""
+        self.ids.append(fragment_id)
+        self.lengths.append(data_length)
+        self.offsets.append(fragment_offset)
+        self.seqs.append(seq_num)
+    
+    def extend_rows(self, other: "FragmentTable", start: int, stop: int):
+        """Copy rows [start, stop) of another table, keeping their sequence numbers"""
+        self.ids.extend(other.ids[start:stop])
+        self.lengths.extend(other.lengths[start:stop])
+        self.offsets.extend(other.offsets[start:stop])
+        self.seqs.extend(other.seqs[start:stop])
+    
+    def rows(self, header_size: int) -> List[FragRow]:
+        """
+        Expand the columns into display-ready records
+        
+        Total size, byte offset and MF flag are derived here once, so the
+        hop tables and the CSV export only have to format them.
+        
+        Args:
+            header_size: IP header size in bytes
+        
+        Returns:
+            One FragRow per fragment, in table order
+        """
+        count = len(self.seqs)
+        if not count:
+            return []
+        lengths, offsets = self.lengths, self.offsets
+        # Only the last fragment of the table clears MF
+        mf_flags = [True] * (count - 1) + [False]
+        return list(map(FragRow._make, zip(
+            self.seqs,
+            self.ids,
+            [length + header_size for length in lengths],
+            lengths,
+            [offset * 8 for offset in offsets],
+            offsets,
+            mf_flags
+        )))
+
+
+@functools.lru_cache(maxsize=32)
+def make_fragmenter(header_size: int, mtu: int) -> Callable[[FragmentTable], FragmentTable]:
+    """
+    Build a hop fragmenter specialized for one (header_size, mtu) link.
+    
+    The aligned payload size and the fit limit are invariant for a link, so
+    they are computed and validated once and bound into the returned closure.
+    Paths that revisit an MTU (e.g. 1500, 576, 1500) share the same function.
+    
+    Args:
+        header_size: IP header size in bytes
+        mtu: Maximum Transmission Unit of the link
+    
+    Returns:
+        Function mapping the FragmentTable arriving at the hop to the one leaving it
+    
+    Raises:
+        ValueError: If the MTU is too small for the header + minimum data
+    """
+    if mtu < header_size + 8:
+        raise ValueError(f"MTU {mtu} too small for header {header_size} + minimum data (8)")
+    
+    max_data = (mtu - header_size) & ~7
+    fit_limit = mtu - header_size
+    
+    def fragment(fragments: FragmentTable) -> FragmentTable:
+        in_lengths = fragments.lengths
+        # Nothing to split on this link: the (read-only) table passes through
+        if not in_lengths or max(in_lengths) <= fit_limit:
+            return fragments
+        
+        result = FragmentTable()
+        ids, lengths, offsets, seqs = result.ids, result.lengths, result.offsets, result.seqs
+        
+        in_ids, in_offsets = fragments.ids, fragments.offsets
+        total = len(in_lengths)
+        
+        # Rows that fit are copied as column slices, one run at a time
+        run_start = 0
+        row = 0
+        while row < total:
+            data_len = in_lengths[row]
+            if data_len <= fit_limit:
+                row += 1
+                continue
+            if run_start < row:
+                result.extend_rows(fragments, run_start, row)
+            
+            # Consecutive rows with the same id and length (all full fragments
+            # of the previous hop) share one layout and are split together
+            frag_id = in_ids[row]
+            end = row + 1
+            while end < total and in_lengths[end] == data_len and in_ids[end] == frag_id:
+                end += 1
+            
+            layout_lengths, rel_offsets = _fragment_layout(data_len, max_data)
+            bases = in_offsets[row:end]
+            last_rel = rel_offsets[-1]
+            if max(bases) + last_rel > 8191:
+                last_offset = next(base for base in bases if base + last_rel > 8191) + last_rel
+                raise ValueError(
+                    f"Fragment offset {last_offset} exceeds maximum (8191). "
+                    f"Packet too large for fragmentation at offset {last_offset * 8} bytes."
+                )
+            
+            # Whole-column copies: array repetition and array-to-array extends are memcpy
+            start = len(seqs)
+            count = len(layout_lengths) * (end - row)
+            ids.extend(array('i', [frag_id]) * count)
+            lengths.extend(layout_lengths * (end - row))
+            if end - row == 1 and not bases[0]:
+                offsets.extend(rel_offsets)
+            else:
+                offsets.extend([base + rel_offset for base in bases for rel_offset in rel_offsets])
+            seqs.extend(range(start + 1, start + count + 1))
+            
+            row = run_start = end
+        
+        if run_start < total:
+            result.extend_rows(fragments, run_start, total)
+        return result
+    
+    return fragment
+
+
+class IPv4Fragmenter:
+    """
+    Core IPv4 fragmentation logic - RFC 791 compliant
+    
+    This class handles the mathematical calculations for packet fragmentation
+    while ensuring proper 8-byte alignment and offset tracking.
+    """
+    
+    @staticmethod
+    def fragment_hop(fragments: FragmentTable, header_size: int, mtu: int) -> FragmentTable:
+        """
+        Forward every fragment of a hop over a link with the given MTU.
+        
+        Fragments that fit are kept unchanged (including their sequence
+        number); larger ones are split and numbered after the rows already
+        emitted. The work is done by the fragmenter specialized for this
+        (header_size, mtu) pair, see make_fragmenter.
+        
+        Args:
+            fragments: Fragments arriving at this hop
+            header_size: IP header size in bytes
+            mtu: Maximum Transmission Unit of the outgoing link
+        
+        Returns:
+            FragmentTable of the fragments leaving this hop; the input table
+            itself when no fragment needs splitting
+        
+        Raises:
+            ValueError: If the MTU is too small or an offset exceeds 8191
+        """
+        result = make_fragmenter(header_size, mtu)(fragments)
+        
+        logging.debug("Hop MTU=%d: %d -> %d fragments", mtu, len(fragments), len(result))
+        return result
+    
+    @staticmethod
+    def validate_fragmentation_inputs(packet_size: int, header_size: int, 
+                                     mtu_path: List[int]) -> None:
+        """
+        Comprehensive validation of fragmentation inputs
+        
+        Args:
+            packet_size: Total packet size in bytes
+            header_size: IP header size in bytes
+            mtu_path: List of MTU values for network hops
+        
+        Raises:
+            ValueError: With detailed error message if validation fails
+        """
+        config = _default_config()
+        
+        # Packet size validation
+        if packet_size < config.min_packet_size:
+            raise ValueError(f"Packet size must be at least {config.min_packet_size} bytes")
+        if packet_size > config.max_packet_size:
+            raise ValueError(f"Packet size cannot exceed {config.max_packet_size} bytes")
+        
+        # Header size validation
+        if header_size < config.min_header_size:
+            raise ValueError(f"Header size must be at least {config.min_header_size} bytes (RFC 791)")
+        if header_size > config.max_header_size:
+            raise ValueError(f"Header size cannot exceed {config.max_header_size} bytes (RFC 791)")
+        if header_size % 4 != 0:
+            raise ValueError("Header size must be a multiple of 4 bytes (RFC 791)")
+        
+        # Data size validation
+        data_size = packet_size - header_size
+        if data_size < 0:
+            raise ValueError("Packet size must be greater than header size")
+        if data_size == 0:
+            raise ValueError("Packet contains no data (header only)")
+        
+        # MTU path validation
+        if not mtu_path:
+            raise ValueError("MTU path cannot be empty")
+        
+        # Fast path: bounds on min/max cover every hop in two C-level passes
+        if (min(mtu_path) >= max(config.min_mtu, header_size + 8)
+                and max(mtu_path) <= config.max_mtu):
+            return
+        
+        # Slow path: locate the first offending hop for the error message
+        for i, mtu in enumerate(mtu_path):
+            if mtu < config.min_mtu:
+                raise ValueError(
+                    f"MTU at hop {i+1} ({mtu} bytes) is below minimum "
+                    f"({config.min_mtu} bytes per RFC 791)"
+                )
+            if mtu > config.max_mtu:
+                raise ValueError(f"MTU at hop {i+1} ({mtu} bytes) exceeds maximum ({config.max_mtu} bytes)")
+            if mtu < header_size + 8:
+                raise ValueError(
+                    f"MTU at hop {i+1} ({mtu} bytes) too small for "
+                    f"header ({header_size} bytes) + minimum data (8 bytes)"
+                )
+
+
+@functools.lru_cache(maxsize=32)
+def parse_and_validate_inputs(packet_text: str, header_text: str,
+                              mtu_text: str) -> Tuple[int, int, Tuple[int, ...]]:
+    """
+    Parse and validate raw input strings.
+    
+    Pure function of the entry contents, so repeated simulations with
+    unchanged inputs reuse the cached result instead of re-parsing.
+    
+    Returns:
+        Tuple of (packet_size, header_size, mtu_path)
+    
+    Raises:
+        ValueError: If a value cannot be parsed or fails validation
+    
+    Example:
+        >>> parse_and_validate_inputs("1500", "20", "1500, 576")
+        (1500, 20, (1500, 576))
+    """
+    packet_size = int(packet_text)
+    header_size = int(header_text)
+    
+    if not mtu_text:
+        raise ValueError("MTU path cannot be empty")
+    
+    # int() ignores surrounding whitespace, so no per-item strip() is needed
+    mtu_path = tuple(map(int, mtu_text.split(',')))
+    
+    # Use centralized validation
+    IPv4Fragmenter.validate_fragmentation_inputs(packet_size, header_size, mtu_path)
+    
+    return packet_size, header_size, mtu_path
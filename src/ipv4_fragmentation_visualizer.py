@@ -16,253 +16,35 @@ RFC 791 Compliant
 """
 
 import customtkinter as ctk
-from tkinter import messagebox, filedialog
+from tkinter import messagebox, filedialog, ttk
 import tkinter as tk
-import csv
-import json
+import io
 import logging
+import time
+import weakref
 from logging.handlers import RotatingFileHandler
 from datetime import datetime
-from pathlib import Path
 from typing import List, Tuple, Dict, Any, Optional
-from dataclasses import dataclass, asdict
+
+from ipv4_fragmentation_core import (
+    AppConfig,
+    DesignConstants,
+    FragmentTable,
+    FragRow,
+    HopResult,
+    IPv4Fragmenter,
+    parse_and_validate_inputs,
+)
 
 # Configure CustomTkinter
 ctk.set_appearance_mode("light")
 ctk.set_default_color_theme("blue")
 
+# MF column text, indexed by a fragment's mf_flag
+MF_LABELS = ("0 (Last)", "1 (More)")
 
-# ==================== CONFIGURATION MANAGEMENT ====================
-
-@dataclass
-class AppConfig:
-    """Application configuration with validation limits"""
-    # Theme
-    appearance_mode: str = "light"
-    color_theme: str = "blue"
-    
-    # Window
-    window_width: int = 1400
-    window_height: int = 900
-    min_width: int = 1200
-    min_height: int = 700
-    
-    # Defaults
-    default_packet_size: int = 1500
-    default_header_size: int = 20
-    default_mtu_path: str = "1500, 576, 1500"
-    
-    # Validation Limits (RFC 791 compliant)
-    min_packet_size: int = 20
-    max_packet_size: int = 65535
-    min_header_size: int = 20
-    max_header_size: int = 60
-    min_mtu: int = 68  # RFC 791 minimum
-    max_mtu: int = 65535
-    max_fragment_offset: int = 8191  # 13-bit field maximum
-    
-    # Export
-    export_directory: str = "exports"
-    auto_timestamp: bool = True
-    
-    @classmethod
-    def load(cls, config_path: str = "config.json") -> 'AppConfig':
-        """Load configuration from file"""
-        path = Path(config_path)
-        if path.exists():
-            try:
-                with open(path, 'r') as f:
-                    data = json.load(f)
-                    return cls(**data)
-            except Exception:
-                return cls()
-        return cls()
-    
-    def save(self, config_path: str = "config.json"):
-        """Save configuration to file"""
-        try:
-            with open(config_path, 'w') as f:
-                json.dump(asdict(self), f, indent=2)
-        except Exception as e:
-            logging.error(f"Failed to save config: {e}")
-
-
-# ==================== DESIGN CONSTANTS ====================
-
-class DesignConstants:
-    """UI Design constants for consistent styling"""
-    # Fonts
-    FONT_FAMILY = "Roboto"
-    FONT_SIZE_TITLE = 28
-    FONT_SIZE_SUBTITLE = 13
-    FONT_SIZE_SECTION = 20
-    FONT_SIZE_LABEL = 12
-    FONT_SIZE_INPUT = 14
-    FONT_SIZE_HEADER = 13
-    FONT_SIZE_CELL = 12
-    FONT_SIZE_HOP = 16
-    FONT_SIZE_FOOTER_TITLE = 16
-    FONT_SIZE_FOOTER_TEXT = 11
-    
-    # Spacing
-    PADDING_LARGE = 40
-    PADDING_MEDIUM = 20
-    PADDING_SMALL = 10
-    
-    # Component Sizes
-    INPUT_HEIGHT = 38
-    BUTTON_HEIGHT = 38
-    HEADER_HEIGHT = 80
-    TOOLBAR_HEIGHT = 100
-    TABLE_HEADER_HEIGHT = 40
-    TABLE_ROW_HEIGHT = 36
-    FOOTER_HEIGHT = 180
-    
-    # Corners
-    CORNER_LARGE = 16
-    CORNER_MEDIUM = 8
-    CORNER_SMALL = 6
-
-
-# ==================== FRAGMENTATION CORE LOGIC ====================
-
-class IPv4Fragmenter:
-    """
-    Core IPv4 fragmentation logic - RFC 791 compliant
-    
-    This class handles the mathematical calculations for packet fragmentation
-    while ensuring proper 8-byte alignment and offset tracking.
-    """
-    
-    @staticmethod
-    def fragment_packet(data_size: int, offset: int, header_size: int, 
-                       mtu: int, fragment_id: int) -> List[Tuple[int, int, int, int]]:
-        """
-        Fragment a packet according to MTU constraints and IPv4 specifications.
-        
-        This function implements RFC 791 compliant fragmentation with proper
-        8-byte alignment and fragment offset calculation.
-        
-        Args:
-            data_size: Size of data payload in bytes
-            offset: Starting offset in bytes (must be 8-byte aligned)
-            header_size: IP header size in bytes (20-60, multiple of 4)
-            mtu: Maximum Transmission Unit in bytes (minimum 68)
-            fragment_id: Fragment identification number
-        
-        Returns:
-            List of tuples: (fragment_id, data_length, fragment_offset, sequence_num)
-        
-        Raises:
-            ValueError: If offset exceeds maximum or invalid parameters
-        
-        Example:
-            >>> IPv4Fragmenter.fragment_packet(1480, 0, 20, 576, 12345)
-            [(12345, 556, 0, 1), (12345, 556, 69, 2), (12345, 368, 138, 3)]
-        """
-        if data_size < 0:
-            raise ValueError("Data size cannot be negative")
-        
-        if data_size == 0:
-            raise ValueError("No data to fragment")
-        
-        if mtu < header_size + 8:
-            raise ValueError(f"MTU {mtu} too small for header {header_size} + minimum data (8)")
-        
-        fragments = []
-        max_data = mtu - header_size
-        current_offset = offset
-        seq_num = 1
-        remaining_data = data_size
-        
-        # Ensure max_data is 8-byte aligned
-        max_data = (max_data // 8) * 8
-        
-        logging.debug(f"Fragmenting: data={data_size}, offset={offset}, header={header_size}, mtu={mtu}")
-        
-        while remaining_data > 0:
-            # Calculate fragment data size
-            frag_data = min(remaining_data, max_data)
-            
-            # For non-final fragments, ensure 8-byte alignment
-            if remaining_data > max_data:
-                frag_data = (frag_data // 8) * 8
-            
-            # CRITICAL FIX: Validate offset before creating fragment
-            fragment_offset = current_offset // 8
-            if fragment_offset > 8191:
-                raise ValueError(
-                    f"Fragment offset {fragment_offset} exceeds maximum (8191). "
-                    f"Packet too large for fragmentation at offset {current_offset} bytes."
-                )
-            
-            # Create fragment entry
-            fragments.append((fragment_id, frag_data, fragment_offset, seq_num))
-            
-            logging.debug(f"Fragment #{seq_num}: data={frag_data}B, offset={fragment_offset}")
-            
-            # CRITICAL FIX: Update offset and remaining data correctly
-            remaining_data -= frag_data
-            current_offset += frag_data
-            seq_num += 1
-        
-        logging.info(f"Created {len(fragments)} fragments from {data_size} bytes")
-        return fragments
-    
-    @staticmethod
-    def validate_fragmentation_inputs(packet_size: int, header_size: int, 
-                                     mtu_path: List[int]) -> None:
-        """
-        Comprehensive validation of fragmentation inputs
-        
-        Args:
-            packet_size: Total packet size in bytes
-            header_size: IP header size in bytes
-            mtu_path: List of MTU values for network hops
-        
-        Raises:
-            ValueError: With detailed error message if validation fails
-        """
-        config = AppConfig()
-        
-        # Packet size validation
-        if packet_size < config.min_packet_size:
-            raise ValueError(f"Packet size must be at least {config.min_packet_size} bytes")
-        if packet_size > config.max_packet_size:
-            raise ValueError(f"Packet size cannot exceed {config.max_packet_size} bytes")
-        
-        # Header size validation
-        if header_size < config.min_header_size:
-            raise ValueError(f"Header size must be at least {config.min_header_size} bytes (RFC 791)")
-        if header_size > config.max_header_size:
-            raise ValueError(f"Header size cannot exceed {config.max_header_size} bytes (RFC 791)")
-        if header_size % 4 != 0:
-            raise ValueError("Header size must be a multiple of 4 bytes (RFC 791)")
-        
-        # Data size validation
-        data_size = packet_size - header_size
-        if data_size < 0:
-            raise ValueError("Packet size must be greater than header size")
-        if data_size == 0:
-            raise ValueError("Packet contains no data (header only)")
-        
-        # MTU path validation
-        if not mtu_path:
-            raise ValueError("MTU path cannot be empty")
-        
-        for i, mtu in enumerate(mtu_path):
-            if mtu < config.min_mtu:
-                raise ValueError(
-                    f"MTU at hop {i+1} ({mtu} bytes) is below minimum "
-                    f"({config.min_mtu} bytes per RFC 791)"
-                )
-            if mtu > config.max_mtu:
-                raise ValueError(f"MTU at hop {i+1} ({mtu} bytes) exceeds maximum ({config.max_mtu} bytes)")
-            if mtu < header_size + 8:
-                raise ValueError(
-                    f"MTU at hop {i+1} ({mtu} bytes) too small for "
-                    f"header ({header_size} bytes) + minimum data (8 bytes)"
-                )
+# Hop table row tags, indexed by [row parity][mf_flag]; the MF=0 row is also 'last'
+ROW_TAGS = ((('even', 'last'), ('even',)), (('odd', 'last'), ('odd',)))
 
 
 # ==================== MAIN APPLICATION ====================
@@ -283,6 +65,9 @@ class IPv4FragmentationApp(ctk.CTk):
     def __init__(self):
         super().__init__()
         
+        # Shared fonts need an existing Tk root
+        DesignConstants.init_fonts()
+        
         # Load configuration
         self.config = AppConfig.load()
         
@@ -299,12 +84,21 @@ class IPv4FragmentationApp(ctk.CTk):
         
         # Theme management
         self.current_theme = self.config.appearance_mode
+        # widget -> {option: palette key}; destroyed widgets drop out on their own
+        self._themed_widgets = weakref.WeakKeyDictionary()
         self.setup_themes()
+        self.setup_table_style()
         
         self.configure(fg_color=self.colors['bg'])
         
         # State
         self.current_results: Optional[Dict[str, Any]] = None
+        self._sim_pending: Optional[str] = None
+        self._refresh_pending: Optional[str] = None
+        self._hop_views: List[Dict[str, Any]] = []
+        self._free_hop_views: List[Dict[str, Any]] = []
+        self._hop_placeholders: List[Dict[str, Any]] = []
+        self._materialize_pending: Optional[str] = None
         
         # Create UI
         self.create_header()
@@ -395,10 +189,74 @@ class IPv4FragmentationApp(ctk.CTk):
         }
         self.colors = self.themes[self.current_theme]
     
+    def register_themed(self, widget, **palette_keys: str):
+        """
+        Register widget options that follow the active theme
+        
+        Args:
+            widget: Widget to recolor on theme changes
+            **palette_keys: Widget option name mapped to a palette key,
+                e.g. fg_color='card_bg'
+        """
+        self._themed_widgets[widget] = palette_keys
+    
+    def apply_theme(self):
+        """Recolor every live themed widget in place from the current palette"""
+        colors = self.colors
+        self.configure(fg_color=colors['bg'])
+        self.setup_table_style()
+        
+        for widget, palette_keys in list(self._themed_widgets.items()):
+            if widget.winfo_exists():
+                widget.configure(**{option: colors[key] for option, key in palette_keys.items()})
+        
+        for view in self._hop_views:
+            self.configure_row_tags(view['tree'])
+    
+    def configure_row_tags(self, tree: ttk.Treeview):
+        """Apply theme colors to the row tags of a hop table"""
+        colors = self.colors
+        tree.tag_configure('even', background=colors['row_even'])
+        tree.tag_configure('odd', background=colors['row_odd'])
+        # Treeview styles whole rows, so the MF=0 fragment is highlighted as a row
+        tree.tag_configure(
+            'last',
+            foreground=colors['success'],
+            font=DesignConstants.FONT_CELL_BOLD
+        )
+    
+    def setup_table_style(self):
+        """Apply the current theme colors to the hop table Treeview style"""
+        colors = self.colors
+        style = ttk.Style(self)
+        # 'clam' honours custom heading and field colors on every platform
+        style.theme_use("clam")
+        style.configure(
+            "Fragments.Treeview",
+            background=colors['card_bg'],
+            fieldbackground=colors['card_bg'],
+            foreground=colors['text_dark'],
+            rowheight=DesignConstants.TABLE_ROW_HEIGHT,
+            borderwidth=0,
+            font=DesignConstants.FONT_CELL
+        )
+        style.configure(
+            "Fragments.Treeview.Heading",
+            background=colors['table_header'],
+            foreground=colors['text_dark'],
+            relief="flat",
+            font=DesignConstants.FONT_TABLE_HEADER
+        )
+        style.map(
+            "Fragments.Treeview",
+            background=[('selected', colors['primary'])],
+            foreground=[('selected', 'white')]
+        )
+    
     def setup_keyboard_shortcuts(self):
         """Configure keyboard shortcuts for better UX"""
-        self.bind('<Control-s>', lambda e: self.simulate_fragmentation())
-        self.bind('<Control-S>', lambda e: self.simulate_fragmentation())
+        self.bind('<Control-s>', lambda e: self.schedule_simulation())
+        self.bind('<Control-S>', lambda e: self.schedule_simulation())
         self.bind('<Control-e>', lambda e: self.export_to_csv())
         self.bind('<Control-E>', lambda e: self.export_to_csv())
         self.bind('<Control-r>', lambda e: self.reset_inputs())
@@ -417,6 +275,7 @@ class IPv4FragmentationApp(ctk.CTk):
             corner_radius=0,
             height=DesignConstants.HEADER_HEIGHT
         )
+        self.register_themed(header_frame, fg_color='card_bg')
         header_frame.pack(fill="x", padx=0, pady=0)
         header_frame.pack_propagate(False)
         
@@ -424,32 +283,27 @@ class IPv4FragmentationApp(ctk.CTk):
         title_label = ctk.CTkLabel(
             header_frame,
             text="IPv4 Fragmentation Visualizer",
-            font=ctk.CTkFont(
-                family=DesignConstants.FONT_FAMILY,
-                size=DesignConstants.FONT_SIZE_TITLE,
-                weight="bold"
-            ),
+            font=DesignConstants.FONT_TITLE,
             text_color=self.colors['primary']
         )
+        self.register_themed(title_label, text_color='primary')
         title_label.pack(side="left", padx=DesignConstants.PADDING_LARGE, pady=DesignConstants.PADDING_MEDIUM)
         
         # Subtitle
         subtitle_label = ctk.CTkLabel(
             header_frame,
             text="RFC 791 Compliant • v2.0 Professional Edition",
-            font=ctk.CTkFont(
-                family=DesignConstants.FONT_FAMILY,
-                size=DesignConstants.FONT_SIZE_SUBTITLE
-            ),
+            font=DesignConstants.FONT_SUBTITLE,
             text_color=self.colors['text_light']
         )
+        self.register_themed(subtitle_label, text_color='text_light')
         subtitle_label.pack(side="left", padx=(0, DesignConstants.PADDING_LARGE))
         
         # Theme toggle button
         theme_btn = ctk.CTkButton(
             header_frame,
             text="🌓 Theme",
-            font=ctk.CTkFont(family=DesignConstants.FONT_FAMILY, size=12),
+            font=DesignConstants.FONT_LABEL,
             fg_color=self.colors['primary'],
             hover_color=self.colors['primary_hover'],
             corner_radius=DesignConstants.CORNER_MEDIUM,
@@ -457,13 +311,14 @@ class IPv4FragmentationApp(ctk.CTk):
             height=30,
             command=self.toggle_theme
         )
+        self.register_themed(theme_btn, fg_color='primary', hover_color='primary_hover')
         theme_btn.pack(side="right", padx=DesignConstants.PADDING_LARGE)
         
         # Help button
         help_btn = ctk.CTkButton(
             header_frame,
             text="❓ Help",
-            font=ctk.CTkFont(family=DesignConstants.FONT_FAMILY, size=12),
+            font=DesignConstants.FONT_LABEL,
             fg_color=self.colors['success'],
             hover_color="#28A745",
             corner_radius=DesignConstants.CORNER_MEDIUM,
@@ -471,6 +326,7 @@ class IPv4FragmentationApp(ctk.CTk):
             height=30,
             command=self.show_help
         )
+        self.register_themed(help_btn, fg_color='success')
         help_btn.pack(side="right", padx=(0, 10))
     
     def create_input_section(self):
@@ -483,6 +339,7 @@ class IPv4FragmentationApp(ctk.CTk):
             border_color=self.colors['border'],
             height=DesignConstants.TOOLBAR_HEIGHT
         )
+        self.register_themed(toolbar, fg_color='card_bg', border_color='border')
         toolbar.pack(fill="x", padx=0, pady=0)
         toolbar.pack_propagate(False)
         
@@ -522,28 +379,22 @@ class IPv4FragmentationApp(ctk.CTk):
         simulate_btn = ctk.CTkButton(
             btn_container,
             text="▶ Simulate (Ctrl+S)",
-            font=ctk.CTkFont(
-                family=DesignConstants.FONT_FAMILY,
-                size=DesignConstants.FONT_SIZE_INPUT,
-                weight="bold"
-            ),
+            font=DesignConstants.FONT_INPUT_BOLD,
             fg_color=self.colors['primary'],
             hover_color=self.colors['primary_hover'],
             corner_radius=DesignConstants.CORNER_MEDIUM,
             height=DesignConstants.BUTTON_HEIGHT,
             width=160,
-            command=self.simulate_fragmentation
+            command=self.schedule_simulation
         )
+        self.register_themed(simulate_btn, fg_color='primary', hover_color='primary_hover')
         simulate_btn.pack(pady=(18, 0))
         
         # Reset Button
         reset_btn = ctk.CTkButton(
             btn_container,
             text="↻ Reset (Ctrl+R)",
-            font=ctk.CTkFont(
-                family=DesignConstants.FONT_FAMILY,
-                size=DesignConstants.FONT_SIZE_LABEL
-            ),
+            font=DesignConstants.FONT_LABEL,
             fg_color=self.colors['warning'],
             hover_color="#E68900",
             corner_radius=DesignConstants.CORNER_MEDIUM,
@@ -551,16 +402,14 @@ class IPv4FragmentationApp(ctk.CTk):
             width=80,
             command=self.reset_inputs
         )
+        self.register_themed(reset_btn, fg_color='warning')
         reset_btn.pack(side="left", pady=(5, 0))
         
         # Export Button
         export_btn = ctk.CTkButton(
             btn_container,
             text="💾 Export (Ctrl+E)",
-            font=ctk.CTkFont(
-                family=DesignConstants.FONT_FAMILY,
-                size=DesignConstants.FONT_SIZE_LABEL
-            ),
+            font=DesignConstants.FONT_LABEL,
             fg_color=self.colors['success'],
             hover_color="#28A745",
             corner_radius=DesignConstants.CORNER_MEDIUM,
@@ -569,6 +418,7 @@ class IPv4FragmentationApp(ctk.CTk):
             command=self.export_to_csv,
             state="disabled"
         )
+        self.register_themed(export_btn, fg_color='success')
         export_btn.pack(side="left", pady=(5, 0), padx=(5, 0))
         self.export_btn = export_btn
     
@@ -584,22 +434,20 @@ class IPv4FragmentationApp(ctk.CTk):
         label = ctk.CTkLabel(
             label_container,
             text=label_text,
-            font=ctk.CTkFont(
-                family=DesignConstants.FONT_FAMILY,
-                size=DesignConstants.FONT_SIZE_LABEL,
-                weight="bold"
-            ),
+            font=DesignConstants.FONT_LABEL_BOLD,
             text_color=self.colors['text_dark']
         )
+        self.register_themed(label, text_color='text_dark')
         label.pack(side="left")
         
         if tooltip:
             tooltip_label = ctk.CTkLabel(
                 label_container,
                 text=" ⓘ",
-                font=ctk.CTkFont(family=DesignConstants.FONT_FAMILY, size=10),
+                font=DesignConstants.FONT_TOOLTIP,
                 text_color=self.colors['text_light']
             )
+            self.register_themed(tooltip_label, text_color='text_light')
             tooltip_label.pack(side="left")
             # Store tooltip for potential hover display
             tooltip_label.tooltip_text = tooltip
@@ -608,14 +456,12 @@ class IPv4FragmentationApp(ctk.CTk):
             field_frame,
             width=width,
             height=DesignConstants.INPUT_HEIGHT,
-            font=ctk.CTkFont(
-                family=DesignConstants.FONT_FAMILY,
-                size=DesignConstants.FONT_SIZE_INPUT
-            ),
+            font=DesignConstants.FONT_INPUT,
             fg_color=self.colors['card_bg'],
             border_color=self.colors['border'],
             text_color=self.colors['text_dark']
         )
+        self.register_themed(entry, fg_color='card_bg', border_color='border', text_color='text_dark')
         entry.insert(0, default_value)
         entry.pack()
         
@@ -625,6 +471,7 @@ class IPv4FragmentationApp(ctk.CTk):
         """Create scrollable visualization area"""
         # Container
         viz_container = ctk.CTkFrame(self, fg_color=self.colors['bg'])
+        self.register_themed(viz_container, fg_color='bg')
         viz_container.pack(fill="both", expand=True, padx=0, pady=0)
         
         # Scrollable frame
@@ -633,8 +480,17 @@ class IPv4FragmentationApp(ctk.CTk):
             fg_color=self.colors['bg'],
             corner_radius=0
         )
+        self.register_themed(self.viz_scroll, fg_color='bg')
         self.viz_scroll.pack(fill="both", expand=True, padx=DesignConstants.PADDING_LARGE, 
                             pady=DesignConstants.PADDING_MEDIUM)
+        self._hop_views = []
+        self._free_hop_views = []
+        self._hop_placeholders = []
+        
+        # Materialize hop tables as they scroll into view
+        canvas = self.viz_scroll._parent_canvas
+        canvas.configure(yscrollcommand=self._on_viz_yview)
+        canvas.bind("<Configure>", self._schedule_materialize, add="+")
         
         # Don't automatically show welcome - let caller decide
     
@@ -647,25 +503,23 @@ class IPv4FragmentationApp(ctk.CTk):
             border_width=2,
             border_color=self.colors['primary']
         )
+        self.register_themed(welcome_frame, fg_color='card_bg', border_color='primary')
         welcome_frame.pack(fill="both", expand=True, pady=50, padx=50)
         
         icon_label = ctk.CTkLabel(
             welcome_frame,
             text="📦",
-            font=ctk.CTkFont(size=64)
+            font=DesignConstants.FONT_ICON
         )
         icon_label.pack(pady=(40, 20))
         
         title_label = ctk.CTkLabel(
             welcome_frame,
             text="Welcome to IPv4 Fragmentation Visualizer",
-            font=ctk.CTkFont(
-                family=DesignConstants.FONT_FAMILY,
-                size=24,
-                weight="bold"
-            ),
+            font=DesignConstants.FONT_WELCOME_TITLE,
             text_color=self.colors['primary']
         )
+        self.register_themed(title_label, text_color='primary')
         title_label.pack(pady=(0, 20))
         
         instructions = [
@@ -677,16 +531,15 @@ class IPv4FragmentationApp(ctk.CTk):
             "💡 Tip: Press F1 for keyboard shortcuts and help"
         ]
         
+        text_light = self.colors['text_light']
         for instruction in instructions:
             inst_label = ctk.CTkLabel(
                 welcome_frame,
                 text=instruction,
-                font=ctk.CTkFont(
-                    family=DesignConstants.FONT_FAMILY,
-                    size=DesignConstants.FONT_SIZE_SUBTITLE
-                ),
-                text_color=self.colors['text_light']
+                font=DesignConstants.FONT_SUBTITLE,
+                text_color=text_light
             )
+            self.register_themed(inst_label, text_color='text_light')
             inst_label.pack(pady=5)
         
         welcome_frame.pack(pady=(20, 40))
@@ -713,6 +566,7 @@ class IPv4FragmentationApp(ctk.CTk):
             border_width=2,
             border_color=self.colors['primary']
         )
+        self.register_themed(footer, fg_color='footer_bg', border_color='primary')
         footer.pack(fill="x", pady=40, padx=40)
         footer._is_footer = True
         
@@ -720,63 +574,50 @@ class IPv4FragmentationApp(ctk.CTk):
         title_label = ctk.CTkLabel(
             footer,
             text="IPv4 Fragmentation Visualizer - Professional Edition",
-            font=ctk.CTkFont(
-                family=DesignConstants.FONT_FAMILY,
-                size=18,
-                weight="bold"
-            ),
+            font=DesignConstants.FONT_FOOTER_HEADING,
             text_color=self.colors['primary']
         )
+        self.register_themed(title_label, text_color='primary')
         title_label.pack(pady=(25, 5))
         
         # Version
         version_label = ctk.CTkLabel(
             footer,
             text="Version 2.0",
-            font=ctk.CTkFont(
-                family=DesignConstants.FONT_FAMILY,
-                size=14,
-                weight="bold"
-            ),
+            font=DesignConstants.FONT_INPUT_BOLD,
             text_color=self.colors['footer_text']
         )
+        self.register_themed(version_label, text_color='footer_text')
         version_label.pack(pady=2)
         
         # Developer
         dev_label = ctk.CTkLabel(
             footer,
             text="Développé par : Abderrahmane Aroussi",
-            font=ctk.CTkFont(
-                family=DesignConstants.FONT_FAMILY,
-                size=13
-            ),
+            font=DesignConstants.FONT_SUBTITLE,
             text_color=self.colors['footer_text']
         )
+        self.register_themed(dev_label, text_color='footer_text')
         dev_label.pack(pady=5)
         
         # Copyright
         copyright_label = ctk.CTkLabel(
             footer,
             text="Tous droits réservés © 2026",
-            font=ctk.CTkFont(
-                family=DesignConstants.FONT_FAMILY,
-                size=12
-            ),
+            font=DesignConstants.FONT_LABEL,
             text_color=self.colors['text_light']
         )
+        self.register_themed(copyright_label, text_color='text_light')
         copyright_label.pack(pady=2)
         
         # Description
         desc_label = ctk.CTkLabel(
             footer,
             text="Créé pour simplifier le calcul des fragments IPv4.",
-            font=ctk.CTkFont(
-                family=DesignConstants.FONT_FAMILY,
-                size=12,
-                slant="italic"
-            ),
+            font=DesignConstants.FONT_ITALIC,
             text_color=self.colors['text_light']
         )
+        self.register_themed(desc_label, text_color='text_light')
         desc_label.pack(pady=8)
         
         # GitHub link (clickable)
@@ -786,14 +627,11 @@ class IPv4FragmentationApp(ctk.CTk):
         github_label = ctk.CTkLabel(
             github_frame,
             text="🔗 GitHub Repository",
-            font=ctk.CTkFont(
-                family=DesignConstants.FONT_FAMILY,
-                size=12,
-                underline=True
-            ),
+            font=DesignConstants.FONT_LINK,
             text_color=self.colors['primary'],
             cursor="hand2"
         )
+        self.register_themed(github_label, text_color='primary')
         github_label.pack()
         
         # Make GitHub label clickable
@@ -807,18 +645,18 @@ class IPv4FragmentationApp(ctk.CTk):
         rfc_label = ctk.CTkLabel(
             footer,
             text="RFC 791 Compliant ✓",
-            font=ctk.CTkFont(
-                family=DesignConstants.FONT_FAMILY,
-                size=11
-            ),
+            font=DesignConstants.FONT_FOOTER_TEXT,
             text_color=self.colors['success']
         )
+        self.register_themed(rfc_label, text_color='success')
         rfc_label.pack(pady=(0, 15))
     
-    def validate_inputs(self) -> Tuple[int, int, List[int]]:
+    def validate_inputs(self) -> Tuple[int, int, Tuple[int, ...]]:
         """
         Comprehensive input validation with detailed error messages
         
+        Parsing and validation of unchanged entry text is served from cache.
+        
         Returns:
             Tuple of (packet_size, header_size, mtu_path)
         
@@ -826,26 +664,36 @@ class IPv4FragmentationApp(ctk.CTk):
             ValueError: With detailed validation error message
         """
         try:
-            # Parse inputs
-            packet_size = int(self.packet_size_entry.get().strip())
-            header_size = int(self.header_size_entry.get().strip())
-            mtu_input = self.mtu_path_entry.get().strip()
-            
-            if not mtu_input:
-                raise ValueError("MTU path cannot be empty")
-            
-            mtu_path = [int(x.strip()) for x in mtu_input.split(',')]
-            
-            # Use centralized validation
-            IPv4Fragmenter.validate_fragmentation_inputs(packet_size, header_size, mtu_path)
+            packet_size, header_size, mtu_path = parse_and_validate_inputs(
+                self.packet_size_entry.get().strip(),
+                self.header_size_entry.get().strip(),
+                self.mtu_path_entry.get().strip()
+            )
             
-            self.logger.info(f"Validation passed: packet={packet_size}, header={header_size}, mtu_path={mtu_path}")
+            self.logger.info(f"Validation passed: packet={packet_size}, header={header_size}, mtu_path={list(mtu_path)}")
             return packet_size, header_size, mtu_path
             
         except ValueError as e:
             self.logger.error(f"Validation failed: {str(e)}")
             raise ValueError(f"Input Validation Error:\n\n{str(e)}")
     
+    def schedule_simulation(self):
+        """
+        Debounce simulation requests
+        
+        Key auto-repeat on Ctrl+S or rapid clicks on Simulate are coalesced
+        into a single run once the burst settles.
+        """
+        if self._sim_pending is not None:
+            self.after_cancel(self._sim_pending)
+        self._sim_pending = self.after(DesignConstants.SIMULATE_DEBOUNCE_MS,
+                                       self._run_scheduled_simulation)
+    
+    def _run_scheduled_simulation(self):
+        """Run the simulation requested by schedule_simulation"""
+        self._sim_pending = None
+        self.simulate_fragmentation()
+    
     def simulate_fragmentation(self):
         """
         Run fragmentation simulation with comprehensive error handling and logging
@@ -856,77 +704,13 @@ class IPv4FragmentationApp(ctk.CTk):
             # Validate inputs
             packet_size, header_size, mtu_path = self.validate_inputs()
             
-            # Clear previous results
-            self.clear_visualization_area()
-            
-            # Generate unique fragment ID (timestamp-based)
-            fragment_id = int(datetime.now().timestamp() * 1000) % 65536
-            
-            # Initialize results storage
-            self.current_results = {
-                'fragment_id': fragment_id,
-                'original_packet_size': packet_size,
-                'header_size': header_size,
-                'mtu_path': mtu_path,
-                'hops': [],
-                'timestamp': datetime.now().isoformat()
-            }
-            
-            # Initial packet data
-            data_size = packet_size - header_size
-            fragments = [(fragment_id, data_size, 0, 1)]
-            
-            self.logger.info(f"Simulating fragmentation: ID={fragment_id}, Data={data_size}B")
-            
-            # Process each hop
-            for hop_idx, mtu in enumerate(mtu_path):
-                self.logger.info(f"Processing hop {hop_idx + 1}/{len(mtu_path)}: MTU={mtu}")
-                
-                new_fragments = []
-                
-                for frag_id, data_len, offset, seq_num in fragments:
-                    # Check if fragmentation needed
-                    if data_len + header_size <= mtu:
-                        # No fragmentation needed
-                        new_fragments.append((frag_id, data_len, offset, seq_num))
-                        self.logger.debug(f"Fragment #{seq_num} fits in MTU (no fragmentation)")
-                    else:
-                        # Fragment needed
-                        self.logger.debug(f"Fragmenting #{seq_num}: {data_len}B at offset {offset}")
-                        
-                        # Calculate offset in bytes for this fragment
-                        offset_bytes = offset * 8
-                        
-                        # Fragment the data
-                        sub_fragments = IPv4Fragmenter.fragment_packet(
-                            data_len, offset_bytes, header_size, mtu, frag_id
-                        )
-                        
-                        # Renumber sequences relative to current position
-                        for idx, (fid, dlen, off, _) in enumerate(sub_fragments):
-                            new_seq = len(new_fragments) + 1
-                            new_fragments.append((fid, dlen, off, new_seq))
-                
-                fragments = new_fragments
-                
-                # Store hop data
-                hop_data = {
-                    'hop_num': hop_idx + 1,
-                    'mtu': mtu,
-                    'fragments': [(fid, dlen, off, seq) for fid, dlen, off, seq in fragments]
-                }
-                self.current_results['hops'].append(hop_data)
-                
-                # Visualize this hop
-                self.create_hop_table(hop_idx + 1, mtu, fragments, header_size, fragment_id)
+            results = self._compute_results(packet_size, header_size, mtu_path)
+            self.current_results = results
+            self._render_results(results)
             
-            # Enable export button
-            self.export_btn.configure(state="normal")
-            
-            # Update footer with developer info
-            self.create_footer()
-            
-            self.logger.info(f"Simulation completed successfully: {len(fragments)} final fragments")
+            self.logger.info(
+                f"Simulation completed successfully: {len(results['hops'][-1].fragments)} final fragments"
+            )
             # No popup - results are visible in the UI
             
         except ValueError as e:
@@ -939,24 +723,198 @@ class IPv4FragmentationApp(ctk.CTk):
                 f"An unexpected error occurred:\n\n{str(e)}\n\nCheck logs for details."
             )
     
+    def _compute_results(self, packet_size: int, header_size: int,
+                         mtu_path: Tuple[int, ...]) -> Dict[str, Any]:
+        """
+        Run the fragmentation pipeline over the MTU path without touching widgets
+        
+        Returns:
+            Results dictionary with one entry per hop
+        """
+        # Generate unique fragment ID (timestamp-based, ~1 ms resolution)
+        fragment_id = (time.time_ns() >> 20) & 0xFFFF
+        
+        # Initialize results storage
+        results = {
+            'fragment_id': fragment_id,
+            'original_packet_size': packet_size,
+            'header_size': header_size,
+            'mtu_path': mtu_path,
+            'hops': [],
+            'timestamp': datetime.now().isoformat()
+        }
+        
+        # Initial packet data
+        data_size = packet_size - header_size
+        fragments = FragmentTable()
+        fragments.append(fragment_id, data_size, 0, 1)
+        
+        self.logger.info(f"Simulating fragmentation: ID={fragment_id}, Data={data_size}B")
+        
+        # Process each hop
+        rows: List[FragRow] = []
+        hop_count = len(mtu_path)
+        for hop_idx, mtu in enumerate(mtu_path):
+            self.logger.info(f"Processing hop {hop_idx + 1}/{hop_count}: MTU={mtu}")
+            
+            forwarded = IPv4Fragmenter.fragment_hop(fragments, header_size, mtu)
+            # Display records are built once per table; unsplit hops share them
+            if forwarded is not fragments or not rows:
+                rows = forwarded.rows(header_size)
+            fragments = forwarded
+            
+            # Store hop data
+            results['hops'].append(HopResult(hop_idx + 1, mtu, rows))
+        
+        return results
+    
+    def _render_results(self, results: Dict[str, Any]):
+        """
+        Display simulation results in the visualization area
+        
+        Each hop gets a lightweight placeholder frame sized for its table; the
+        table itself is only built once the placeholder nears the viewport
+        (see _materialize_visible). Hop tables from the previous run go back
+        to a pool and are refilled instead of recreated.
+        """
+        for slot in self._hop_placeholders:
+            if slot['view'] is not None:
+                self._release_hop_view(slot)
+        
+        # Remove everything but pooled hop tables (old placeholders, welcome screen, footer)
+        pooled = {view['frame'] for view in self._hop_views}
+        for widget in self.viz_scroll.winfo_children():
+            if widget not in pooled:
+                widget.destroy()
+        
+        self._hop_placeholders = []
+        for hop in results['hops']:
+            placeholder = ctk.CTkFrame(
+                self.viz_scroll,
+                fg_color="transparent",
+                height=self._estimate_hop_height(len(hop.fragments))
+            )
+            placeholder.pack(fill="x", pady=(0, DesignConstants.PADDING_MEDIUM))
+            self._hop_placeholders.append({
+                'placeholder': placeholder,
+                'hop': hop,
+                'packet_id': results['fragment_id'],
+                'view': None
+            })
+        
+        # Enable export button
+        self.export_btn.configure(state="normal")
+        
+        # Update footer with developer info
+        self.create_footer()
+        
+        self._schedule_materialize()
+    
+    def _estimate_hop_height(self, fragment_count: int) -> int:
+        """Approximate height of a hop table, used for unmaterialized placeholders"""
+        rows = min(fragment_count, DesignConstants.TABLE_MAX_VISIBLE_ROWS)
+        return (DesignConstants.HOP_HEADER_HEIGHT + DesignConstants.TABLE_HEADER_HEIGHT
+                + rows * DesignConstants.TABLE_ROW_HEIGHT + DesignConstants.PADDING_MEDIUM)
+    
+    def _on_viz_yview(self, first: str, last: str):
+        """Forward canvas scroll updates to the scrollbar and queue materialization"""
+        self.viz_scroll._scrollbar.set(first, last)
+        self._schedule_materialize()
+    
+    def _schedule_materialize(self, event=None):
+        """Coalesce scroll and resize events into one visibility pass"""
+        if self._materialize_pending is None:
+            self._materialize_pending = self.after_idle(self._materialize_visible)
+    
+    def _materialize_visible(self):
+        """
+        Build hop tables near the viewport and release those far outside it
+        
+        Placeholders within HOP_PRELOAD_SCREENS viewport heights get a table;
+        tables further away than HOP_RELEASE_SCREENS go back to the pool.
+        """
+        self._materialize_pending = None
+        if not self._hop_placeholders:
+            return
+        
+        canvas = self.viz_scroll._parent_canvas
+        self.viz_scroll.update_idletasks()
+        
+        # The inner frame sits at canvas origin, so canvas y equals frame y
+        view_top = canvas.canvasy(0)
+        screen = max(canvas.winfo_height(), 1)
+        view_bottom = view_top + screen
+        preload = screen * DesignConstants.HOP_PRELOAD_SCREENS
+        release = screen * DesignConstants.HOP_RELEASE_SCREENS
+        
+        for slot in self._hop_placeholders:
+            placeholder = slot['placeholder']
+            top = placeholder.winfo_y()
+            bottom = top + placeholder.winfo_height()
+            if slot['view'] is None:
+                if bottom >= view_top - preload and top <= view_bottom + preload:
+                    self._attach_hop_view(slot)
+            elif bottom < view_top - release or top > view_bottom + release:
+                self._release_hop_view(slot)
+    
+    def _attach_hop_view(self, slot: Dict[str, Any]):
+        """Fill a pooled (or new) hop table and pack it into its placeholder"""
+        hop = slot['hop']
+        # A released table still showing this hop (scrolled back, re-rendered
+        # results) is reused as is; otherwise refill the least recently released
+        cached = [view for view in self._free_hop_views if view['hop'] is hop]
+        if cached:
+            view = cached[0]
+            self._free_hop_views.remove(view)
+        elif self._free_hop_views:
+            view = self._free_hop_views.pop(0)
+            self.update_hop_table(view, hop.hop_num, hop.mtu, hop.fragments)
+        else:
+            view = self.create_hop_table(hop.hop_num, hop.mtu, hop.fragments,
+                                         slot['packet_id'])
+            self._hop_views.append(view)
+        view['hop'] = hop
+        
+        # Hop tables are siblings of the placeholders, packed inside them
+        view['frame'].pack(in_=slot['placeholder'], fill="x")
+        view['frame'].lift()
+        slot['view'] = view
+    
+    def _release_hop_view(self, slot: Dict[str, Any]):
+        """Detach a hop table from its placeholder and return it to the pool"""
+        view = slot['view']
+        view['frame'].pack_forget()
+        slot['view'] = None
+        self._free_hop_views.append(view)
+        # Keep the scroll length stable while the hop is unmaterialized
+        slot['placeholder'].configure(
+            height=self._estimate_hop_height(len(slot['hop'].fragments))
+        )
+    
     def clear_visualization_area(self):
         """Clear visualization area efficiently"""
         self.logger.debug("Clearing visualization area")
         # Remove only child widgets, not the scrollable frame itself
         for widget in self.viz_scroll.winfo_children():
             widget.destroy()
+        self._hop_views = []
+        self._free_hop_views = []
+        self._hop_placeholders = []
     
-    def create_hop_table(self, hop_num: int, mtu: int, fragments: List[Tuple[int, int, int, int]],
-                        header_size: int, packet_id: int):
+    def create_hop_table(self, hop_num: int, mtu: int, fragments: List[FragRow],
+                        packet_id: int) -> Dict[str, Any]:
         """
         Create a properly aligned table for hop visualization
         
         Args:
             hop_num: Hop number (1-indexed)
             mtu: MTU for this hop
-            fragments: List of (fragment_id, data_size, offset, seq_num)
-            header_size: IP header size
+            fragments: Precomputed fragment rows of this hop
             packet_id: Packet identification number
+        
+        Returns:
+            Dictionary of the hop widgets, reusable with update_hop_table.
+            The hop frame is left unpacked for the caller to place.
         """
         # Hop Container
         hop_frame = ctk.CTkFrame(
@@ -966,7 +924,7 @@ class IPv4FragmentationApp(ctk.CTk):
             border_width=1,
             border_color=self.colors['border']
         )
-        hop_frame.pack(fill="x", pady=(0, DesignConstants.PADDING_MEDIUM))
+        self.register_themed(hop_frame, fg_color='card_bg', border_color='border')
         
         # Hop Info Header
         header_container = ctk.CTkFrame(hop_frame, fg_color="transparent")
@@ -974,14 +932,11 @@ class IPv4FragmentationApp(ctk.CTk):
         
         hop_label = ctk.CTkLabel(
             header_container,
-            text=f"🔗 Network Hop {hop_num}",
-            font=ctk.CTkFont(
-                family=DesignConstants.FONT_FAMILY,
-                size=DesignConstants.FONT_SIZE_HOP,
-                weight="bold"
-            ),
+            text="",
+            font=DesignConstants.FONT_HOP,
             text_color=self.colors['primary']
         )
+        self.register_themed(hop_label, text_color='primary')
         hop_label.pack(side="left")
         
         mtu_badge = ctk.CTkFrame(
@@ -989,121 +944,147 @@ class IPv4FragmentationApp(ctk.CTk):
             fg_color=self.colors['primary'],
             corner_radius=12
         )
+        self.register_themed(mtu_badge, fg_color='primary')
         mtu_badge.pack(side="left", padx=15)
         
         mtu_label = ctk.CTkLabel(
             mtu_badge,
-            text=f"MTU: {mtu} bytes",
-            font=ctk.CTkFont(
-                family=DesignConstants.FONT_FAMILY,
-                size=DesignConstants.FONT_SIZE_LABEL,
-                weight="bold"
-            ),
+            text="",
+            font=DesignConstants.FONT_LABEL_BOLD,
             text_color="white"
         )
         mtu_label.pack(padx=12, pady=4)
         
         count_label = ctk.CTkLabel(
             header_container,
-            text=f"{len(fragments)} fragment{'s' if len(fragments) > 1 else ''}",
-            font=ctk.CTkFont(
-                family=DesignConstants.FONT_FAMILY,
-                size=DesignConstants.FONT_SIZE_SUBTITLE
-            ),
+            text="",
+            font=DesignConstants.FONT_SUBTITLE,
             text_color=self.colors['text_light']
         )
+        self.register_themed(count_label, text_color='text_light')
         count_label.pack(side="left")
         
-        # Table using grid layout
+        # Fragment table: a single Treeview per hop instead of a widget per cell
         table_frame = ctk.CTkFrame(hop_frame, fg_color="transparent")
         table_frame.pack(fill="x", padx=25, pady=(0, DesignConstants.PADDING_MEDIUM))
         
-        # Configure columns
         headers = ["Seq", "Fragment ID (just example)", "Total Size", "Data Size", "Offset (bytes)", "Offset (units)", "MF Flag"]
-        for i in range(len(headers)):
-            table_frame.grid_columnconfigure(i, weight=1, uniform="col")
-        
-        # Header Row
-        header_row = ctk.CTkFrame(
+        tree = ttk.Treeview(
             table_frame,
-            fg_color=self.colors['table_header'],
-            corner_radius=DesignConstants.CORNER_MEDIUM,
-            height=DesignConstants.TABLE_HEADER_HEIGHT
+            columns=headers,
+            show="headings",
+            style="Fragments.Treeview"
         )
-        header_row.grid(row=0, column=0, columnspan=len(headers), sticky="ew", pady=(0, 5))
-        
-        for i in range(len(headers)):
-            header_row.grid_columnconfigure(i, weight=1, uniform="col")
-        
-        for col_idx, header_text in enumerate(headers):
-            header_label = ctk.CTkLabel(
-                header_row,
-                text=header_text,
-                font=ctk.CTkFont(
-                    family=DesignConstants.FONT_FAMILY,
-                    size=DesignConstants.FONT_SIZE_HEADER,
-                    weight="bold"
-                ),
-                text_color=self.colors['text_dark'],
-                anchor="center"
-            )
-            header_label.grid(row=0, column=col_idx, sticky="ew", padx=5, pady=10)
+        for header_text in headers:
+            tree.heading(header_text, text=header_text)
+            tree.column(header_text, anchor="center", width=120, stretch=True)
+        
+        self.configure_row_tags(tree)
+        tree.pack(side="left", fill="x", expand=True)
+        
+        # Long tables scroll inside the Treeview, which only draws visible rows
+        scrollbar = ctk.CTkScrollbar(table_frame, command=tree.yview)
+        tree.configure(yscrollcommand=scrollbar.set)
+        # The page scrolls on every wheel event through a bind_all handler, so
+        # a scrolling table must consume the event itself
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            tree.bind(sequence, self._on_hop_table_wheel)
+        
+        view = {
+            'frame': hop_frame,
+            'hop_label': hop_label,
+            'mtu_label': mtu_label,
+            'count_label': count_label,
+            'tree': tree,
+            'scrollbar': scrollbar
+        }
+        self.update_hop_table(view, hop_num, mtu, fragments)
+        return view
+    
+    def _on_hop_table_wheel(self, event):
+        """
+        Scroll a long hop table, not the page, with the mouse wheel
+        
+        Tables that fit without scrolling leave the event to the page.
+        Returning "break" also skips the Treeview class binding, so the
+        table is scrolled here.
+        """
+        tree = event.widget
+        if len(tree.get_children()) <= DesignConstants.TABLE_MAX_VISIBLE_ROWS:
+            return None
+        
+        if event.num == 4:
+            step = -1
+        elif event.num == 5:
+            step = 1
+        else:
+            step = -1 if event.delta > 0 else 1
+        tree.yview_scroll(step, "units")
+        return "break"
+    
+    def update_hop_table(self, view: Dict[str, Any], hop_num: int, mtu: int,
+                         fragments: List[FragRow]):
+        """
+        Fill an existing hop table with new results without recreating widgets
+        
+        Args:
+            view: Widgets returned by create_hop_table
+            hop_num: Hop number (1-indexed)
+            mtu: MTU for this hop
+            fragments: Precomputed fragment rows of this hop
+        """
+        view['hop_label'].configure(text=f"🔗 Network Hop {hop_num}")
+        view['mtu_label'].configure(text=f"MTU: {mtu} bytes")
+        n_frags = len(fragments)
+        view['count_label'].configure(
+            text=f"{n_frags} fragment{'s' if n_frags > 1 else ''}"
+        )
+        
+        tree = view['tree']
+        tree.configure(height=min(n_frags, DesignConstants.TABLE_MAX_VISIBLE_ROWS))
+        
+        # Row items of the previous fill are rewritten in place; only the
+        # difference in row count is inserted or deleted
+        items = tree.get_children()
+        reused = min(len(items), n_frags)
+        if len(items) > n_frags:
+            tree.delete(*items[n_frags:])
         
         # Data Rows
-        for idx, (frag_id, data_size, offset, seq_num) in enumerate(fragments):
-            row_num = idx + 1
-            mf_flag = idx < len(fragments) - 1
-            row_color = self.colors['row_even'] if idx % 2 == 0 else self.colors['row_odd']
-            
-            row_frame = ctk.CTkFrame(
-                table_frame,
-                fg_color=row_color,
-                corner_radius=DesignConstants.CORNER_SMALL,
-                height=DesignConstants.TABLE_ROW_HEIGHT
-            )
-            row_frame.grid(row=row_num, column=0, columnspan=len(headers), sticky="ew", pady=1)
-            
-            for i in range(len(headers)):
-                row_frame.grid_columnconfigure(i, weight=1, uniform="col")
-            
-            offset_bytes = offset * 8
-            
-            row_data = [
-                f"#{seq_num}",
-                f"{frag_id}",
-                f"{data_size + header_size} B",
+        # Plain number columns go to Tk as ints (it renders them the same);
+        # only the prefixed/suffixed cells are formatted in Python
+        for idx, (seq, fid, total_size, data_size, offset_bytes, offset_units, mf_flag) in enumerate(fragments):
+            values = (
+                f"#{seq}",
+                fid,
+                f"{total_size} B",
                 f"{data_size} B",
-                f"{offset_bytes}",
-                f"{offset}",
-                "1 (More)" if mf_flag else "0 (Last)"
-            ]
-            
-            for col_idx, cell_text in enumerate(row_data):
-                if col_idx == 6:  # MF Flag
-                    text_color = self.colors['primary'] if mf_flag else self.colors['success']
-                    font_weight = "bold"
-                elif col_idx == 1:  # Fragment ID
-                    text_color = self.colors['primary']
-                    font_weight = "bold"
-                else:
-                    text_color = self.colors['text_dark']
-                    font_weight = "normal"
-                
-                cell_label = ctk.CTkLabel(
-                    row_frame,
-                    text=cell_text,
-                    font=ctk.CTkFont(
-                        family=DesignConstants.FONT_FAMILY,
-                        size=DesignConstants.FONT_SIZE_CELL,
-                        weight=font_weight
-                    ),
-                    text_color=text_color,
-                    anchor="center"
-                )
-                cell_label.grid(row=0, column=col_idx, sticky="ew", padx=5, pady=8)
+                offset_bytes,
+                offset_units,
+                MF_LABELS[mf_flag]
+            )
+            tags = ROW_TAGS[idx & 1][mf_flag]
+            if idx < reused:
+                tree.item(items[idx], values=values, tags=tags)
+            else:
+                tree.insert("", "end", values=values, tags=tags)
+        # Reused items keep their selection/focus; clear them with the scroll
+        tree.selection_remove(tree.selection())
+        tree.focus("")
+        tree.yview_moveto(0)
+        
+        if n_frags > DesignConstants.TABLE_MAX_VISIBLE_ROWS:
+            view['scrollbar'].pack(side="right", fill="y", before=tree)
+        else:
+            view['scrollbar'].pack_forget()
     
     def export_to_csv(self):
         """Export fragmentation results to CSV with error handling"""
+        # Only needed here: imported on first export instead of at startup
+        import csv
+        import gzip
+        from pathlib import Path
+        
         if not self.current_results:
             messagebox.showwarning("No Data", "Please run a simulation first before exporting.")
             return
@@ -1121,9 +1102,13 @@ class IPv4FragmentationApp(ctk.CTk):
         else:
             default_filename = "fragmentation.csv"
         
+        # No defaultextension: Tk would append ".csv" whichever filter is
+        # selected, so the extension is added below from the chosen filter
+        gzip_filter = "Gzipped CSV files"
+        file_type = tk.StringVar(self)
         filename = filedialog.asksaveasfilename(
-            defaultextension=".csv",
-            filetypes=[("CSV files", "*.csv"), ("All files", "*.*")],
+            filetypes=[("CSV files", "*.csv"), (gzip_filter, "*.csv.gz"), ("All files", "*.*")],
+            typevariable=file_type,
             initialfile=default_filename,
             initialdir=export_dir
         )
@@ -1132,68 +1117,74 @@ class IPv4FragmentationApp(ctk.CTk):
             self.logger.info("Export cancelled by user")
             return
         
+        if not Path(filename).suffix:
+            filename += ".csv.gz" if file_type.get() == gzip_filter else ".csv"
+        
         try:
-            with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
-                writer = csv.writer(csvfile)
-                
-                # Header information
-                writer.writerow(["IPv4 Fragmentation Analysis Report"])
-                writer.writerow(["=" * 60])
-                writer.writerow([])
-                writer.writerow(["Generated:", datetime.now().strftime('%Y-%m-%d %H:%M:%S')])
-                writer.writerow(["Application:", "IPv4 Fragmentation Visualizer v2.0"])
-                writer.writerow([])
-                
-                # Configuration
-                writer.writerow(["CONFIGURATION"])
-                writer.writerow(["-" * 60])
-                writer.writerow(["Fragment ID (just example):", self.current_results['fragment_id']])
-                writer.writerow(["Original Packet Size:", f"{self.current_results['original_packet_size']} bytes"])
-                writer.writerow(["Header Size:", f"{self.current_results['header_size']} bytes"])
-                writer.writerow(["Data Size:", f"{self.current_results['original_packet_size'] - self.current_results['header_size']} bytes"])
-                writer.writerow(["MTU Path:", " → ".join(map(str, self.current_results['mtu_path']))])
-                writer.writerow(["Number of Hops:", len(self.current_results['hops'])])
-                writer.writerow([])
+            results = self.current_results
+            header_size = results['header_size']
+            hops = results['hops']
+            
+            # Header information and configuration
+            rows = [
+                ["IPv4 Fragmentation Analysis Report"],
+                ["=" * 60],
+                [],
+                ["Generated:", datetime.now().strftime('%Y-%m-%d %H:%M:%S')],
+                ["Application:", "IPv4 Fragmentation Visualizer v2.0"],
+                [],
+                ["CONFIGURATION"],
+                ["-" * 60],
+                ["Fragment ID (just example):", results['fragment_id']],
+                ["Original Packet Size:", f"{results['original_packet_size']} bytes"],
+                ["Header Size:", f"{header_size} bytes"],
+                ["Data Size:", f"{results['original_packet_size'] - header_size} bytes"],
+                ["MTU Path:", " → ".join(map(str, results['mtu_path']))],
+                ["Number of Hops:", len(hops)],
+                [],
                 
                 # Fragmentation details for each hop
-                writer.writerow(["FRAGMENTATION DETAILS"])
-                writer.writerow(["=" * 60])
-                
-                for hop in self.current_results['hops']:
-                    writer.writerow([])
-                    writer.writerow([f"Network Hop {hop['hop_num']}", f"MTU: {hop['mtu']} bytes"])
-                    writer.writerow(["-" * 60])
-                    writer.writerow([
-                        "Seq", "Fragment ID (just example)", "Total Size (bytes)", "Data Size (bytes)",
-                        "Offset (bytes)", "Offset (8-byte units)", "MF Flag"
-                    ])
-                    
-                    for idx, (frag_id, data_size, offset, seq_num) in enumerate(hop['fragments']):
-                        mf_flag = "1 (More)" if idx < len(hop['fragments']) - 1 else "0 (Last)"
-                        total_size = data_size + self.current_results['header_size']
-                        offset_bytes = offset * 8
-                        
-                        writer.writerow([
-                            seq_num, frag_id, total_size, data_size,
-                            offset_bytes, offset, mf_flag
-                        ])
-                    
-                    writer.writerow([])
+                ["FRAGMENTATION DETAILS"],
+                ["=" * 60],
+            ]
+            
+            for hop in hops:
+                rows.append([])
+                rows.append([f"Network Hop {hop.hop_num}", f"MTU: {hop.mtu} bytes"])
+                rows.append(["-" * 60])
+                rows.append([
+                    "Seq", "Fragment ID (just example)", "Total Size (bytes)", "Data Size (bytes)",
+                    "Offset (bytes)", "Offset (8-byte units)", "MF Flag"
+                ])
                 
-                # Summary statistics
-                writer.writerow(["SUMMARY"])
-                writer.writerow(["=" * 60])
-                final_hop = self.current_results['hops'][-1]
-                writer.writerow(["Final Fragment Count:", len(final_hop['fragments'])])
-                writer.writerow(["Total Hops:", len(self.current_results['hops'])])
+                # Fragment rows are precomputed; the MF text is a table lookup
+                rows.extend((*row[:6], MF_LABELS[row.mf_flag]) for row in hop.fragments)
                 
-                total_overhead = sum(
-                    len(hop['fragments']) * self.current_results['header_size']
-                    for hop in self.current_results['hops']
-                )
-                writer.writerow(["Total Header Overhead:", f"{total_overhead} bytes"])
-                writer.writerow([])
-                writer.writerow(["End of Report"])
+                rows.append([])
+            
+            # Summary statistics
+            # Header overhead is paid once per fragment on every hop
+            total_overhead = sum(len(hop.fragments) for hop in hops) * header_size
+            rows.extend([
+                ["SUMMARY"],
+                ["=" * 60],
+                ["Final Fragment Count:", len(hops[-1].fragments)],
+                ["Total Hops:", len(hops)],
+                ["Total Header Overhead:", f"{total_overhead} bytes"],
+                [],
+                ["End of Report"],
+            ])
+            
+            # Format the whole report in memory, then hit the file with one write
+            buffer = io.StringIO(newline='')
+            csv.writer(buffer).writerows(rows)
+            if filename.endswith('.gz'):
+                # Level 1: large reports shrink several-fold at a fraction of the default cost
+                csvfile = gzip.open(filename, 'wt', newline='', encoding='utf-8', compresslevel=1)
+            else:
+                csvfile = open(filename, 'w', newline='', encoding='utf-8')
+            with csvfile:
+                csvfile.write(buffer.getvalue())
             
             self.logger.info(f"CSV export successful: {filename}")
             messagebox.showinfo(
@@ -1232,84 +1223,44 @@ class IPv4FragmentationApp(ctk.CTk):
         self.current_results = None
         self.export_btn.configure(state="disabled")
     
-    def refresh_ui(self):
-        """Refresh all UI elements to apply theme changes"""
-        # Store current input values before refresh
-        try:
-            current_packet_size = self.packet_size_entry.get()
-            current_header_size = self.header_size_entry.get()
-            current_mtu_path = self.mtu_path_entry.get()
-        except:
-            # If entries don't exist yet, use defaults
-            current_packet_size = str(self.config.default_packet_size)
-            current_header_size = str(self.config.default_header_size)
-            current_mtu_path = self.config.default_mtu_path
-        
-        # Update main window background
-        self.configure(fg_color=self.colors['bg'])
-        
-        # Clear existing widgets
-        for widget in self.winfo_children():
-            widget.destroy()
-        
-        # Recreate UI with new theme
-        self.create_header()
-        self.create_input_section()
-        self.create_visualization_area()
-        
-        # Restore input values
-        self.packet_size_entry.delete(0, tk.END)
-        self.packet_size_entry.insert(0, current_packet_size)
-        
-        self.header_size_entry.delete(0, tk.END)
-        self.header_size_entry.insert(0, current_header_size)
-        
-        self.mtu_path_entry.delete(0, tk.END)
-        self.mtu_path_entry.insert(0, current_mtu_path)
-        
-        # Restore previous state if simulation was run
-        if self.current_results:
-            # Clear welcome screen first (to avoid duplication)
-            self.clear_visualization_area()
-            
-            # Recreate each hop table
-            for hop in self.current_results['hops']:
-                self.create_hop_table(
-                    hop['hop_num'],
-                    hop['mtu'],
-                    hop['fragments'],
-                    self.current_results['header_size'],
-                    self.current_results['fragment_id']
-                )
-            
-            # Recreate footer (only once)
-            self.create_footer()
-            
-            # Re-enable export button
-            self.export_btn.configure(state="normal")
-        else:
-            # Show welcome message only if no results
-            self.show_welcome_message()
-        
-        # Re-setup keyboard shortcuts
-        self.setup_keyboard_shortcuts()
-    
     def toggle_theme(self):
-        """Switch between light and dark themes with immediate UI update"""
+        """Switch between light and dark themes; the UI update is debounced"""
+        # self.colors keeps the applied palette until _do_refresh recolors, so
+        # widgets created in the meantime still match the rest of the UI
         self.current_theme = "dark" if self.current_theme == "light" else "light"
-        self.colors = self.themes[self.current_theme]
         
         self.logger.info(f"Theme switched to: {self.current_theme}")
+        self._schedule_refresh()
+    
+    def _schedule_refresh(self):
+        """
+        Debounce theme refreshes
+        
+        Repeated Ctrl+T presses or clicks are coalesced into a single recolor
+        (and config write) for the theme selected once the burst settles.
+        """
+        if self._refresh_pending is not None:
+            self.after_cancel(self._refresh_pending)
+        self._refresh_pending = self.after(DesignConstants.THEME_DEBOUNCE_MS,
+                                           self._do_refresh)
+    
+    def _do_refresh(self):
+        """Apply the theme requested by toggle_theme"""
+        self._refresh_pending = None
+        # An even number of toggles lands back on the applied theme
+        if self.current_theme == self.config.appearance_mode:
+            return
         
         # Update appearance mode
+        self.colors = self.themes[self.current_theme]
         ctk.set_appearance_mode(self.current_theme)
         
         # Save preference
         self.config.appearance_mode = self.current_theme
         self.config.save()
         
-        # Refresh UI immediately to apply theme
-        self.refresh_ui()
+        # Recolor existing widgets instead of rebuilding the UI
+        self.apply_theme()
     
     def show_help(self):
         """Display help dialog with keyboard shortcuts and tips"""
@@ -1366,7 +1317,7 @@ For more information, consult RFC 791.
         
         text_widget = ctk.CTkTextbox(
             text_frame,
-            font=ctk.CTkFont(family="Courier New", size=12),
+            font=DesignConstants.FONT_MONO,
             wrap="word"
         )
         text_widget.pack(fill="both", expand=True)
@@ -0,0 +1,205 @@
+"""
+Tests for the Tk-free fragmentation core
+
+The hop fragmenter (make_fragmenter / IPv4Fragmenter.fragment_hop) works on
+whole runs of fragments at once; these tests pin it to the straightforward
+per-fragment loop it replaced.
+"""
+
+import dataclasses
+import doctest
+import json
+import os
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+import ipv4_fragmentation_core  # noqa: E402
+from ipv4_fragmentation_core import (  # noqa: E402
+    AppConfig, FragmentTable, IPv4Fragmenter, parse_and_validate_inputs
+)
+
+
+# ==================== REFERENCE IMPLEMENTATION ====================
+
+def reference_split(data_size, offset_units, header_size, mtu, fragment_id):
+    """Split one fragment byte by byte, as the original per-fragment code did"""
+    max_data = ((mtu - header_size) // 8) * 8
+    pieces = []
+    current_offset = offset_units * 8
+    remaining = data_size
+    while remaining > 0:
+        frag_data = min(remaining, max_data)
+        fragment_offset = current_offset // 8
+        if fragment_offset > 8191:
+            raise ValueError(f"Fragment offset {fragment_offset} exceeds maximum (8191)")
+        pieces.append((fragment_id, frag_data, fragment_offset))
+        remaining -= frag_data
+        current_offset += frag_data
+    return pieces
+
+
+def reference_hop(fragments, header_size, mtu):
+    """
+    Forward a hop with the original per-fragment loop
+    
+    Fragments that fit keep their sequence number; split pieces are numbered
+    after the rows emitted so far.
+    """
+    result = []
+    for frag_id, data_size, offset, seq_num in fragments:
+        if data_size + header_size <= mtu:
+            result.append((frag_id, data_size, offset, seq_num))
+        else:
+            for piece in reference_split(data_size, offset, header_size, mtu, frag_id):
+                result.append(piece + (len(result) + 1,))
+    return result
+
+
+def random_cases(count, seed):
+    """Random (packet_size, header_size, mtu_path) triples"""
+    rng = random.Random(seed)
+    cases = []
+    for _ in range(count):
+        header_size = rng.choice(range(20, 61, 4))
+        packet_size = rng.randint(header_size + 1, 65535)
+        mtu_path = [rng.randint(max(68, header_size + 8), 9000) for _ in range(rng.randint(1, 5))]
+        cases.append((packet_size, header_size, mtu_path))
+    return cases
+
+
+def initial_table(packet_size, header_size, fragment_id=1234):
+    table = FragmentTable()
+    table.append(fragment_id, packet_size - header_size, 0, 1)
+    return table
+
+
+# ==================== TESTS ====================
+
+@pytest.mark.parametrize("packet_size, header_size, mtu_path", random_cases(300, seed=7))
+def test_fragment_hop_matches_reference(packet_size, header_size, mtu_path):
+    table = initial_table(packet_size, header_size)
+    expected = list(table)
+    
+    for mtu in mtu_path:
+        expected = reference_hop(expected, header_size, mtu)
+        table = IPv4Fragmenter.fragment_hop(table, header_size, mtu)
+        assert list(table) == expected
+        
+        rows = table.rows(header_size)
+        assert [(r.fid, r.data_size, r.offset_units, r.seq) for r in rows] == expected
+        assert [r.total_size for r in rows] == [d + header_size for _, d, _, _ in expected]
+        assert [r.offset_bytes for r in rows] == [o * 8 for _, _, o, _ in expected]
+        # Only the last fragment of a hop clears MF
+        assert [r.mf_flag for r in rows] == [True] * (len(rows) - 1) + [False]
+
+
+def test_fitting_fragments_keep_their_sequence_numbers():
+    # 1500 -> 576 splits the 1480-byte fragment but keeps the short tail as is
+    table = initial_table(3000, 20)
+    table = IPv4Fragmenter.fragment_hop(table, 20, 1500)
+    assert list(table) == [(1234, 1480, 0, 1), (1234, 1480, 185, 2), (1234, 20, 370, 3)]
+    
+    table = IPv4Fragmenter.fragment_hop(table, 20, 576)
+    assert [seq for _, _, _, seq in table] == [1, 2, 3, 4, 5, 6, 3]
+    assert [length for _, length, _, _ in table] == [552, 552, 376, 552, 552, 376, 20]
+
+
+def test_unsplit_hop_passes_table_through():
+    table = IPv4Fragmenter.fragment_hop(initial_table(1000, 20), 20, 1500)
+    assert IPv4Fragmenter.fragment_hop(table, 20, 1500) is table
+
+
+def test_mtu_too_small_raises():
+    with pytest.raises(ValueError, match="too small"):
+        IPv4Fragmenter.fragment_hop(initial_table(1000, 60), 60, 64)
+
+
+def test_offset_overflow_raises():
+    table = FragmentTable()
+    table.append(1, 1000, 8190, 1)
+    with pytest.raises(ValueError, match="exceeds maximum"):
+        IPv4Fragmenter.fragment_hop(table, 20, 576)
+
+
+def test_docstring_examples():
+    results = doctest.testmod(ipv4_fragmentation_core)
+    assert results.attempted > 0
+    assert results.failed == 0
+
+
+# ==================== INPUT PARSING ====================
+
+@pytest.mark.parametrize("packet_text, header_text, mtu_text, expected", [
+    ("1500", "20", "1500, 576, 1500", (1500, 20, (1500, 576, 1500))),
+    (" 4000 ", "60", "9000", (4000, 60, (9000,))),
+    # Boundary MTUs take the min/max fast path
+    ("65535", "20", "68,65535", (65535, 20, (68, 65535))),
+])
+def test_parse_valid_inputs(packet_text, header_text, mtu_text, expected):
+    result = parse_and_validate_inputs(packet_text, header_text, mtu_text)
+    assert result == expected
+    assert isinstance(result[2], tuple)
+
+
+@pytest.mark.parametrize("packet_text, header_text, mtu_text, message", [
+    ("1500", "16", "1500", "Header size must be at least 20"),
+    ("1500", "22", "1500", "multiple of 4"),
+    ("1500", "20", "1500, 67", "MTU at hop 2 \\(67 bytes\\) is below minimum"),
+    ("1500", "20", "576, 70000", "MTU at hop 2 \\(70000 bytes\\) exceeds maximum"),
+    ("1500", "20", "1500, abc", "invalid literal"),
+    ("1500", "20", "", "cannot be empty"),
+])
+def test_parse_invalid_inputs_raise_every_time(packet_text, header_text, mtu_text, message):
+    # The parser is cached; failures must not be, so a retry raises again
+    for _ in range(2):
+        with pytest.raises(ValueError, match=message):
+            parse_and_validate_inputs(packet_text, header_text, mtu_text)
+
+
+# ==================== CONFIG ====================
+
+def test_config_reload_sees_edits(tmp_path):
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps({"appearance_mode": "dark", "window_width": 1600}))
+    config = AppConfig.load(str(path))
+    assert (config.appearance_mode, config.window_width) == ("dark", 1600)
+    
+    # The parse cache is keyed on mtime, so a bumped mtime must force a re-read
+    mtime_ns = path.stat().st_mtime_ns
+    path.write_text(json.dumps({"appearance_mode": "light", "window_width": 1280}))
+    os.utime(path, ns=(mtime_ns + 1_000_000_000, mtime_ns + 1_000_000_000))
+    config = AppConfig.load(str(path))
+    assert (config.appearance_mode, config.window_width) == ("light", 1280)
+
+
+def test_config_missing_file_gives_defaults(tmp_path):
+    assert AppConfig.load(str(tmp_path / "missing.json")) == AppConfig()
+
+
+def test_config_corrupt_file_gives_defaults(tmp_path):
+    path = tmp_path / "config.json"
+    path.write_text("{not json")
+    assert AppConfig.load(str(path)) == AppConfig()
+
+
+def test_config_save_load_round_trips_every_field(tmp_path):
+    # Give every field a non-default value of its own type
+    changed = {}
+    for field in dataclasses.fields(AppConfig):
+        default = field.default
+        if isinstance(default, bool):
+            changed[field.name] = not default
+        elif isinstance(default, int):
+            changed[field.name] = default + 1
+        else:
+            changed[field.name] = default + "-changed"
+    config = AppConfig(**changed)
+    
+    path = str(tmp_path / "config.json")
+    config.save(path)
+    assert AppConfig.load(path) == config